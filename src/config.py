@@ -1,6 +1,21 @@
+import os
+
 AMOUNT_OF_SIGNALS_TO_FORCE_SHUTDOWN = 3
 CLEANUP_INTERVAL = 60
 NOTIFICATION_INTERVAL = 10
 NOTIFICATION_MESSAGE_STRIP = 50
 POLLING_INTERVAL = 2
+SHUTDOWN_BROADCAST_EVERY_N_POLLS = 10
 TIME_TO_WAIT_FOR_SHUTDOWN = 30 * 60  # 30 minutes
+SEND_QUEUE_SIZE = 256
+SEND_TIMEOUT = 5  # seconds a single frame may take to reach the client
+CLOSE_TIMEOUT = 2  # seconds to wait for a close handshake
+BROADCAST_BATCH_SIZE = 1000  # enqueues between event loop yields
+IDLE_TIMEOUT = 300  # seconds of client silence before the server pings it
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # WARNING recommended in production
+# comma separated; a set keeps the per-request origin check O(1)
+CORS_ALLOW_ORIGINS = frozenset(
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+)
@@ -1,30 +1,66 @@
 import asyncio
+import secrets
 import time
-import uuid
 from contextlib import suppress
-from typing import Any, Dict, Set
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
 
 from fastapi import HTTPException, WebSocket
+from fastapi.websockets import WebSocketState
 from loguru import logger
 
-from src.config import CLEANUP_INTERVAL
+from src.config import (
+    BROADCAST_BATCH_SIZE,
+    CLEANUP_INTERVAL,
+    CLOSE_TIMEOUT,
+    SEND_QUEUE_SIZE,
+    SEND_TIMEOUT,
+)
+
+
+@dataclass(slots=True)
+class ConnectionInfo:
+    """Per-connection state; slotted to keep it small with many clients."""
+
+    id: str
+    ws: WebSocket
+    connected_at: float
+    last_active: float
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+    )
+    writer: Optional[asyncio.Task] = None
 
 
 class ConnectionManager:
     """
     Optimized WebSocket connection manager with:
     - O(1) lookups by client_id
-    - proper ping frames
-    - improved locking strategy
+    - per-connection outbound queues drained by writer tasks
+    - protocol-level ping frames (delegated to the ASGI server)
+    - lock-free read snapshots, locking only structural changes
     - safer disconnect logic
     """
 
     def __init__(self) -> None:
-        self._ws_to_info: Dict[WebSocket, Dict[str, Any]] = {}
-        self._id_to_ws: Dict[str, WebSocket] = {}
-
+        self._ws_to_info: Dict[WebSocket, ConnectionInfo] = {}
+        # both indices share one ConnectionInfo per connection
+        self._id_to_info: Dict[str, ConnectionInfo] = {}
+        # immutable copy of the connections shared by readers (copy-on-write):
+        # dropped on every connect/disconnect, rebuilt by the next reader
+        self._snapshot: Optional[Tuple[ConnectionInfo, ...]] = None
+
+        # Guards structural changes (connect/disconnect) only. Readers copy
+        # the maps in one synchronous step, which cannot interleave with a
+        # writer on a single event loop, so they never wait on it.
         self._lock = asyncio.Lock()
         self.accepting_connections = True
+        # set while no client is connected; graceful shutdown waits on it
+        self.all_disconnected = asyncio.Event()
+        self.all_disconnected.set()
+        # the inverse: set while at least one client is connected, so idle
+        # background loops can park on it instead of polling
+        self.has_connections = asyncio.Event()
         self._cleanup_task = None
 
     # ---------------- CONNECTION MGMT ---------------- #
@@ -38,94 +74,218 @@ class ConnectionManager:
 
         # client_id must be unique always
         if not client_id:
-            client_id = f"cli_{uuid.uuid4().hex}"
+            client_id = "cli_" + secrets.token_hex(16)
+
+        now = time.monotonic()
+        info = ConnectionInfo(
+            id=client_id, ws=websocket, connected_at=now, last_active=now
+        )
 
         async with self._lock:
-            self._ws_to_info[websocket] = {
-                "id": client_id,
-                "connected_at": time.time(),
-                "last_active": time.time(),
-            }
-            self._id_to_ws[client_id] = websocket
+            self._ws_to_info[websocket] = info
+            self._id_to_info[client_id] = info
+            self._snapshot = None
+            self.all_disconnected.clear()
+            self.has_connections.set()
 
-        logger.info(f"WebSocket connected: {client_id}")
+        info.writer = asyncio.create_task(self._writer_loop(websocket, info))
+
+        logger.info("WebSocket connected: {}", client_id)
 
         return client_id
 
     async def disconnect(self, websocket: WebSocket) -> None:
         async with self._lock:
             info = self._ws_to_info.pop(websocket, None)
-            if info:
-                client_id = info["id"]
-                self._id_to_ws.pop(client_id, None)
-            else:
+            if info is None:
                 return
-
-        logger.info(f"WebSocket disconnected: {client_id}")
+            self._snapshot = None
+            client_id = info.id
+            # a reconnect may have re-registered the same id already
+            if self._id_to_info.get(client_id) is info:
+                del self._id_to_info[client_id]
+            if not self._ws_to_info:
+                self.all_disconnected.set()
+                self.has_connections.clear()
+
+        writer = info.writer
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+        # drop undelivered messages so flush() waiters are released
+        queue = info.queue
+        while not queue.empty():
+            queue.get_nowait()
+            queue.task_done()
+
+        logger.info("WebSocket disconnected: {}", client_id)
 
     async def send_personal_message(self, message: str, websocket: WebSocket) -> None:
-        try:
-            await websocket.send_text(message)
-            async with self._lock:
-                if websocket in self._ws_to_info:
-                    self._ws_to_info[websocket]["last_active"] = time.time()
-        except Exception as e:
-            logger.warning(f"Error sending personal message: {e}")
-            await self.disconnect(websocket)
+        self.send_personal_message_nowait(message, websocket)
 
-    async def broadcast(self, message: str, exclude: Set[WebSocket] = None) -> None:
-        exclude = exclude or set()
+    def send_personal_message_nowait(self, message: str, websocket: WebSocket) -> None:
+        """
+        Queue a message without awaiting; for callers already running on the
+        loop (the /ws endpoint) this skips a coroutine per message.
+        """
+        info = self._ws_to_info.get(websocket)
+        if info is None:
+            logger.warning("Personal message to unknown connection dropped")
+            return
 
-        async with self._lock:
-            connections = list(self._ws_to_info.keys())
+        self._enqueue(info, {"type": "websocket.send", "text": message})
 
-        disconnected = []
-        for ws in connections:
-            if ws in exclude:
-                continue
-            try:
-                await ws.send_text(message)
-                async with self._lock:
-                    if ws in self._ws_to_info:
-                        self._ws_to_info[ws]["last_active"] = time.time()
-            except Exception:
-                disconnected.append(ws)
+    async def broadcast(self, message: str, exclude: Set[WebSocket] = None) -> None:
+        await self.broadcast_prepared(
+            {"type": "websocket.send", "text": message}, exclude
+        )
 
-        for ws in disconnected:
-            logger.warning("Broadcast failed: removing dead connection")
-            await self.disconnect(ws)
+    async def broadcast_bytes(
+        self, payload: bytes, exclude: Set[WebSocket] = None
+    ) -> None:
+        """
+        Broadcast a pre-encoded payload as binary frames. The same buffer is
+        queued for every connection, so it is encoded once regardless of
+        fan-out.
+        """
+        await self.broadcast_prepared(
+            {"type": "websocket.send", "bytes": payload}, exclude
+        )
+
+    async def broadcast_prepared(
+        self, event: Dict[str, Any], exclude: Set[WebSocket] = None
+    ) -> None:
+        """
+        Queue one ready-made ASGI ``websocket.send`` event for every client.
+        The event is built once and shared, writers hand it to the server
+        as is.
+        """
+        if exclude:
+            # exclude is tiny (usually the sender): drop it up front instead
+            # of probing it once per connection
+            remaining = dict(self._ws_to_info)
+            for ws in exclude:
+                remaining.pop(ws, None)
+            targets = tuple(remaining.values())
+        else:
+            targets = self._connections()
+
+        # yield between batches so a large fan-out cannot stall the loop;
+        # targets is our own snapshot, so iterating it across yields is safe
+        enqueue = self._enqueue
+        for i, info in enumerate(targets, 1):
+            enqueue(info, event)
+            if i % BROADCAST_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+
+    async def flush(self) -> None:
+        """Wait until every message queued so far has been written out."""
+        queues = tuple(info.queue for info in self._connections())
+
+        await asyncio.gather(*(queue.join() for queue in queues))
+
+    def _connections(self) -> Tuple[ConnectionInfo, ...]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = tuple(self._ws_to_info.values())
+        return snapshot
+
+    def _enqueue(self, info: ConnectionInfo, event: Dict[str, Any]) -> None:
+        queue = info.queue
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # drop the oldest frame: a lagging client should still get the
+            # latest state once it catches up
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(event)
+            logger.warning("Send queue full, oldest message dropped: {}", info.id)
+
+    async def _writer_loop(self, websocket: WebSocket, info: ConnectionInfo) -> None:
+        """
+        Drains one connection's outbound queue, so a slow client only
+        delays its own messages.
+        """
+        queue = info.queue
+
+        while True:
+            event = await queue.get()
+            try:
+                # a peer that stopped reading must not pin its buffers forever
+                await asyncio.wait_for(websocket.send(event), timeout=SEND_TIMEOUT)
+                # plain store on this connection's own entry, no lock needed
+                info.last_active = time.monotonic()
+            except asyncio.TimeoutError:
+                logger.warning("Send timed out, dropping client: {}", info.id)
+                await self.disconnect(websocket)
+                with suppress(Exception):
+                    await asyncio.wait_for(
+                        websocket.close(code=1008, reason="Client too slow"),
+                        timeout=CLOSE_TIMEOUT,
+                    )
+                return
+            except Exception as e:
+                logger.warning("Error sending message to {}: {}", info.id, e)
+                await self.disconnect(websocket)
+                return
+            finally:
+                queue.task_done()
 
     async def close_all(
         self, code: int = 1001, reason: str = "Server shutting down"
     ) -> None:
-        async with self._lock:
-            conns = list(self._ws_to_info.keys())
+        conns = tuple(self._ws_to_info)
+
+        await asyncio.gather(
+            *(self._close_one(ws, code, reason) for ws in conns),
+            return_exceptions=True,
+        )
+
+        logger.info("Closed all WebSocket connections: {}", len(conns))
 
-        for ws in conns:
-            with suppress(Exception):
-                await ws.close(code=code, reason=reason)
-            await self.disconnect(ws)
+    async def _close_one(self, websocket: WebSocket, code: int, reason: str) -> None:
+        # a peer that stopped reading cannot hold up the whole shutdown
+        with suppress(Exception):
+            await asyncio.wait_for(
+                websocket.close(code=code, reason=reason), timeout=CLOSE_TIMEOUT
+            )
+        await self.disconnect(websocket)
 
-        logger.info(f"Closed all WebSocket connections: {len(conns)}")
+    @property
+    def size(self) -> int:
+        """Number of connected clients, readable without awaiting."""
+        return len(self._ws_to_info)
 
     async def count(self) -> int:
-        async with self._lock:
-            return len(self._ws_to_info)
+        return self.size
 
     async def get_active_clients(self) -> Dict[str, Dict[str, Any]]:
-        async with self._lock:
-            return {
-                info["id"]: {
-                    "connected_at": info["connected_at"],
-                    "last_active": info["last_active"],
-                    "connection_duration": time.time() - info["connected_at"],
-                }
-                for info in self._ws_to_info.values()
+        snapshot = [
+            (info.id, info.connected_at, info.last_active)
+            for info in self._ws_to_info.values()
+        ]
+
+        # stored values are monotonic; report epoch timestamps to API users
+        now = time.monotonic()
+        to_wall = time.time() - now
+        return {
+            client_id: {
+                "connected_at": to_wall + connected_at,
+                "last_active": to_wall + last_active,
+                "connection_duration": now - connected_at,
             }
+            for client_id, connected_at, last_active in snapshot
+        }
+
+    def is_connected(self, websocket: WebSocket) -> bool:
+        """Whether this exact socket is still registered (ids may be reused)."""
+        return websocket in self._ws_to_info
 
     async def get_websocket(self, client_id: str):
-        async with self._lock:
-            return self._id_to_ws.get(client_id)
+        # single dict read: nothing to serialize against
+        info = self._id_to_info.get(client_id)
+        return info.ws if info is not None else None
 
     async def start_connection_cleanup(self, interval: int = CLEANUP_INTERVAL):
         async def cleanup():
@@ -142,15 +302,30 @@ class ConnectionManager:
                 await self._cleanup_task
 
     async def _check_connections(self):
-        async with self._lock:
-            connections = list(self._ws_to_info.items())
-
-        for ws, info in connections:
-            try:
-                await ws.send("ping")
-            except Exception:
-                logger.warning(f"Dead connection detected: {info['id']}")
-                await self.disconnect(ws)
+        """
+        Evicts connections that are already closed or whose writer has died.
+        Peer liveness itself is checked by the ASGI server with protocol-level
+        PING frames (uvicorn --ws-ping-interval / --ws-ping-timeout).
+        """
+        connections = tuple(self._ws_to_info.items())
+
+        dead = [ws for ws, info in connections if not self._is_alive(ws, info)]
+        if not dead:
+            return
+
+        logger.warning("Dead connections detected: {}", len(dead))
+        await asyncio.gather(
+            *(self.disconnect(ws) for ws in dead), return_exceptions=True
+        )
+
+    @staticmethod
+    def _is_alive(websocket: WebSocket, info: ConnectionInfo) -> bool:
+        writer = info.writer
+        return (
+            websocket.client_state == WebSocketState.CONNECTED
+            and websocket.application_state == WebSocketState.CONNECTED
+            and (writer is None or not writer.done())
+        )
 
 
 connection_manager = ConnectionManager()
@@ -1,31 +1,37 @@
 import asyncio
 import logging
 import os
+import sys
 from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
+from src.config import CORS_ALLOW_ORIGINS, LOG_LEVEL
 from src.connection_manager import connection_manager
 from src.routers.rest import router as rest_router
 from src.routers.websocket import router as websocket_router
 from src.signal_handler import signal_handler
 from src.utils import notification_loop
 
-# --------------------- SIGNAL HANDLER------------------------
-signal_handler.install()
-
 # ------------------------ LOGGING ------------------------
 logging.getLogger("uvicorn.error").disabled = True
 logging.getLogger("uvicorn.access").disabled = True
 
+logger.remove()
+logger.add(sys.stderr, level=LOG_LEVEL)
+
 
 # ------------------------ FASTAPI APP ------------------------
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info(f"🚀 [{os.getpid()}] Application started (docs: /docs)")
 
+    # Registered on the running loop, after uvicorn installed its own handlers
+    signal_handler.install()
+
     # Start background notification task
     notification_task = asyncio.create_task(notification_loop(connection_manager))
 
@@ -48,6 +54,8 @@ app = FastAPI(
     description="WebSocket notification server with broadcast and personal message support",
     version="2.0.0",
     lifespan=lifespan,
+    # /status serializes every connected client: use the C JSON encoder
+    default_response_class=ORJSONResponse,
 )
 
 # ------------------------ ROUTES ------------------------
@@ -57,7 +65,7 @@ app.include_router(websocket_router)
 # ------------------------ CORS ------------------------
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # SAFE default
+    allow_origins=CORS_ALLOW_ORIGINS,  # SAFE default: http://localhost:3000
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
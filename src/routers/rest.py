@@ -9,7 +9,7 @@ router = APIRouter(tags=["REST"])
 
 @router.get("/")
 async def root():
-    logger.info("Health check")
+    logger.debug("Health check")
     return {
         "status": "ok",
         "service": "WebSocket Notification Server",
@@ -37,7 +37,7 @@ async def broadcast_message(payload: BroadcastRequest):
     if not payload.message:
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    logger.info("Broadcast request", message=payload.message)
+    logger.debug("Broadcast request", message=payload.message)
 
     await manager.broadcast(payload.message)
 
@@ -56,7 +56,7 @@ async def send_to_client(client_id: str, payload: PersonalMessageRequest):
     if ws is None:
         raise HTTPException(status_code=404, detail="Client not connected")
 
-    logger.info("Sending personal message", client_id=client_id)
+    logger.debug("Sending personal message", client_id=client_id)
 
     await manager.send_personal_message(payload.message, ws)
 
@@ -1,12 +1,26 @@
 import asyncio
+from contextlib import suppress
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from loguru import logger
 
+from src.config import CLOSE_TIMEOUT, IDLE_TIMEOUT
 from src.connection_manager import connection_manager
 
 router = APIRouter(tags=["WebSocket"])
 
+_BROADCAST_PREFIX = "/broadcast "
+_BROADCAST_PREFIX_LEN = len(_BROADCAST_PREFIX)
+# longest padded "ping" still normalized; anything longer is never a ping
+_PING_MAX_LEN = 16
+
+
+def _is_ping(data: str) -> bool:
+    # exact match first, normalize only short messages
+    if data == "ping":
+        return True
+    return len(data) <= _PING_MAX_LEN and data.strip().lower() == "ping"
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket, client_id: str | None = None):
@@ -23,42 +37,52 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str | None = None)
     try:
         assigned_id = await manager.connect(websocket, client_id)
 
-        await manager.send_personal_message(
+        manager.send_personal_message_nowait(
             f"Welcome! Your client ID is: {assigned_id}", websocket
         )
 
-        logger.info("WS client connected", client_id=assigned_id)
+        logger.debug("WS client connected", client_id=assigned_id)
 
         while True:
             try:
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=300)
+                data = await asyncio.wait_for(
+                    websocket.receive_text(), timeout=IDLE_TIMEOUT
+                )
 
-                cleaned = data.strip().lower()
-
-                if cleaned == "ping":
-                    await manager.send_personal_message("pong", websocket)
+                if _is_ping(data):
+                    manager.send_personal_message_nowait("pong", websocket)
                     continue
 
-                if cleaned.startswith("/broadcast "):
-                    message = data[len("/broadcast ") :].strip()
-                    await manager.broadcast(
-                        f"[Broadcast from {assigned_id}]: {message}",
-                        exclude={websocket},
-                    )
-                    await manager.send_personal_message("Broadcast sent.", websocket)
-                    continue
+                if data[:_BROADCAST_PREFIX_LEN].lower() == _BROADCAST_PREFIX:
+                    message = data[_BROADCAST_PREFIX_LEN:].strip()
+                    # an empty broadcast is not a command: it is echoed back
+                    if message:
+                        await manager.broadcast(
+                            f"[Broadcast from {assigned_id}]: {message}",
+                            exclude={websocket},
+                        )
+                        manager.send_personal_message_nowait(
+                            "Broadcast sent.", websocket
+                        )
+                        continue
 
-                await manager.send_personal_message(f"Echo: {data}", websocket)
+                manager.send_personal_message_nowait(f"Echo: {data}", websocket)
 
             except asyncio.TimeoutError:
-                try:
-                    await manager.send_personal_message("ping", websocket)
-                except Exception:
+                # sends are queued now: a failed delivery shows up as the
+                # writer having unregistered this connection
+                if not manager.is_connected(websocket):
                     logger.warning(
                         "Client unresponsive — closing connection",
                         client_id=assigned_id,
                     )
+                    with suppress(Exception):
+                        await asyncio.wait_for(
+                            websocket.close(code=1008, reason="Client unresponsive"),
+                            timeout=CLOSE_TIMEOUT,
+                        )
                     break
+                manager.send_personal_message_nowait("ping", websocket)
 
     except WebSocketDisconnect:
         logger.info("Client disconnected", client_id=assigned_id)
@@ -66,4 +90,4 @@ async def websocket_endpoint(websocket: WebSocket, client_id: str | None = None)
         logger.exception(f"Unhandled WebSocket error for client {assigned_id}: {exc}")
     finally:
         await manager.disconnect(websocket)
-        logger.info("Client cleanup done", client_id=assigned_id)
+        logger.debug("Client cleanup done", client_id=assigned_id)
@@ -1,7 +1,5 @@
 import asyncio
-import os
 import signal
-from functools import partial
 
 from loguru import logger
 
@@ -22,6 +20,9 @@ class SignalHandler:
     def __init__(self):
         self.shutdown_in_progress = False
         self.signal_count = 0
+        self._handed_over = False
+        self._loop = None
+        self._tasks = set()
 
         self.original = {
             signal.SIGINT: signal.getsignal(signal.SIGINT),
@@ -29,18 +30,27 @@ class SignalHandler:
         }
 
     async def handle(self, sig: signal.Signals):
-        """Main graceful-shutdown flow."""
+        """
+        Main graceful-shutdown flow. Each decision below reads and updates
+        the state before its first await, so a burst of signals can neither
+        start a second shutdown nor forward more than once.
+        """
 
         self.signal_count += 1
         if self.signal_count >= AMOUNT_OF_SIGNALS_TO_FORCE_SHUTDOWN:
-            logger.warning("Force shutdown activated — forwarding signal immediately.")
-            self.restore_original_handlers()
-            await self.forward_signal(sig)
+            if not self._handed_over:
+                logger.warning(
+                    "Force shutdown activated — forwarding signal immediately."
+                )
+            await self.hand_over(sig)
             return
 
         if self.shutdown_in_progress:
             logger.warning(
-                f"Received {sig.name} ({self.signal_count}/{AMOUNT_OF_SIGNALS_TO_FORCE_SHUTDOWN})"
+                "Received {} ({}/{})",
+                sig.name,
+                self.signal_count,
+                AMOUNT_OF_SIGNALS_TO_FORCE_SHUTDOWN,
             )
             return
 
@@ -52,10 +62,18 @@ class SignalHandler:
         try:
             await graceful_shutdown(connection_manager)
         except Exception as e:
-            logger.exception(f"Graceful shutdown failure: {e}")
+            logger.exception("Graceful shutdown failure: {}", e)
         finally:
             logger.info("Graceful shutdown complete. Forwarding signal to uvicorn.")
 
+        await self.hand_over(sig)
+
+    async def hand_over(self, sig: signal.Signals):
+        """Give the signal back to uvicorn, once: later callers are no-ops."""
+        if self._handed_over:
+            return
+        self._handed_over = True
+
         self.restore_original_handlers()
         await self.forward_signal(sig)
 
@@ -68,24 +86,56 @@ class SignalHandler:
 
         await asyncio.sleep(0)
 
-        loop.call_soon(os.kill, os.getpid(), sig.value)
+        # raise_signal delivers to this process directly, no pid lookup
+        loop.call_soon(signal.raise_signal, sig)
 
     def restore_original_handlers(self):
         """Restore uvicorn's original handlers before forwarding the signal."""
         for sig, handler in self.original.items():
+            if self._loop is not None:
+                self._loop.remove_signal_handler(sig)
             signal.signal(sig, handler)
+        self._loop = None
 
     def install(self):
         """
-        Install our handlers before uvicorn registers its own.
+        Install our handlers on the running event loop, on top of the ones
+        uvicorn registered. Must be called from inside the loop (lifespan).
         """
+        loop = asyncio.get_running_loop()
+
+        def dispatch(sig: signal.Signals):
+            task = loop.create_task(self.handle(sig))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
 
-        def sync_wrapper(sig, *_):
-            asyncio.create_task(self.handle(sig))
+        for sig in self.original:
+            self.original[sig] = signal.getsignal(sig)
 
-        # partial prevents late binding bugs
-        signal.signal(signal.SIGINT, partial(sync_wrapper, signal.SIGINT))
-        signal.signal(signal.SIGTERM, partial(sync_wrapper, signal.SIGTERM))
+        try:
+            for sig in self.original:
+                # default arg prevents late binding bugs
+                loop.add_signal_handler(sig, lambda s=sig: dispatch(s))
+        except NotImplementedError:
+            # no loop signal support (Windows): plain handlers hop onto the loop
+            self._install_fallback(loop, dispatch)
+            return
+        except (RuntimeError, ValueError) as e:
+            # not the main thread (e.g. TestClient)
+            logger.warning("Signal handlers not installed: {}", e)
+            return
+
+        self._loop = loop
+
+    def _install_fallback(self, loop: asyncio.AbstractEventLoop, dispatch):
+        def handler(signum, frame):
+            loop.call_soon_threadsafe(dispatch, signal.Signals(signum))
+
+        try:
+            for sig in self.original:
+                signal.signal(sig, handler)
+        except ValueError as e:
+            logger.warning("Signal handlers not installed: {}", e)
 
 
 signal_handler = SignalHandler()
@@ -1,11 +1,13 @@
 import asyncio
 import time
+from typing import Set
 
 from loguru import logger
 
 from src.config import (
     NOTIFICATION_INTERVAL,
     POLLING_INTERVAL,
+    SHUTDOWN_BROADCAST_EVERY_N_POLLS,
     TIME_TO_WAIT_FOR_SHUTDOWN,
 )
 from src.connection_manager import ConnectionManager
@@ -19,20 +21,22 @@ async def notification_loop(manager: ConnectionManager) -> None:
 
     try:
         while True:
+            # an idle server parks here instead of waking every interval
+            await manager.has_connections.wait()
             await asyncio.sleep(NOTIFICATION_INTERVAL)
 
-            active_count = await manager.count()
+            active_count = manager.size
             if active_count == 0:
                 continue
 
             counter += 1
             msg = f"[System] Periodic notification #{counter} - Active clients: {active_count}"
-            logger.info(f"Sending periodic notification: {msg}")
+            logger.debug("Sending periodic notification: {}", msg)
 
             try:
                 await manager.broadcast(msg)
             except Exception as exc:
-                logger.error(f"Broadcast failure: {exc}")
+                logger.error("Broadcast failure: {}", exc)
 
     except asyncio.CancelledError:
         logger.info("Notification loop cancelled — stopping cleanly.")
@@ -46,49 +50,98 @@ async def graceful_shutdown(
     """
     Graceful shutdown:
       - if no clients → exit immediately
-      - if clients exist → wait up to wait_seconds
+      - if clients exist → wait up to wait_seconds for the last one to leave
       - then force close all
     """
 
     logger.info("Graceful shutdown started.")
     manager.accepting_connections = False
 
-    start_ts = time.monotonic()
-    last_broadcast_time = 0
+    if manager.all_disconnected.is_set():
+        logger.info("Graceful shutdown: no active clients — exiting immediately.")
+        return
 
-    while True:
-        active = await manager.count()
+    # race "last client left" against the deadline: no polling, and the
+    # shutdown proceeds the moment either one happens
+    all_left = asyncio.create_task(manager.all_disconnected.wait())
+    deadline = asyncio.create_task(asyncio.sleep(wait_seconds))
+    progress_task = asyncio.create_task(
+        _report_shutdown_progress(manager, wait_seconds, poll_interval)
+    )
 
-        if active == 0:
-            logger.info("Graceful shutdown: no active clients — exiting immediately.")
+    try:
+        done, _ = await asyncio.wait(
+            {all_left, deadline}, return_when=asyncio.FIRST_COMPLETED
+        )
+        if all_left in done:
+            logger.info("Graceful shutdown: all clients disconnected.")
             return
 
-        elapsed = time.monotonic() - start_ts
-        remaining = wait_seconds - elapsed
+        logger.warning(
+            "{} seconds elapsed. {} clients still connected. "
+            "Closing all connections forcibly...",
+            wait_seconds,
+            manager.size,
+        )
+        try:
+            await manager.close_all(code=1001, reason="Server shutdown (timeout)")
+        except Exception as exc:
+            logger.error("Error during forced close_all: {}", exc)
+    finally:
+        tasks = (all_left, deadline, progress_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _report_shutdown_progress(
+    manager: ConnectionManager, wait_seconds: int, poll_interval: int
+) -> None:
+    """
+    Logs shutdown progress every poll_interval and tells clients how long
+    they have left every SHUTDOWN_BROADCAST_EVERY_N_POLLS polls. Only
+    reports: the shutdown itself is driven by manager.all_disconnected.
+    """
+    start_ts = time.monotonic()
+    last_broadcast_time = 0
+    # the notices are informational: they run in the background so a slow
+    # fan-out never stretches the poll cadence. Strong refs keep them alive.
+    pending: Set[asyncio.Task] = set()
 
-        if remaining <= 0:
-            logger.warning(
-                f"{wait_seconds} seconds elapsed. {active} clients still connected. "
-                "Closing all connections forcibly..."
+    try:
+        while True:
+            active = manager.size
+            elapsed = time.monotonic() - start_ts
+            remaining = wait_seconds - elapsed
+
+            if (
+                elapsed - last_broadcast_time
+                >= poll_interval * SHUTDOWN_BROADCAST_EVERY_N_POLLS
+            ):
+                last_broadcast_time = elapsed
+                task = asyncio.create_task(
+                    _shutdown_broadcast(
+                        manager,
+                        f"[System] Server is shutting down. Remaining ~{remaining:.0f} sec...",
+                    )
+                )
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            logger.info(
+                "Shutdown waiting: active clients = {}, remaining ~{:.0f} sec...",
+                active,
+                remaining,
             )
-            try:
-                await manager.close_all(code=1001, reason="Server shutdown (timeout)")
-            except Exception as exc:
-                logger.error(f"Error during forced close_all: {exc}")
-            return
 
-        if elapsed - last_broadcast_time >= poll_interval * 10:
-            last_broadcast_time = elapsed
-            try:
-                await manager.broadcast(
-                    f"[System] Server is shutting down. Remaining ~{remaining:.0f} sec..."
-                )
-            except Exception as exc:
-                logger.error(f"Shutdown broadcast failed: {exc}")
+            await asyncio.sleep(poll_interval)
+    finally:
+        for task in pending:
+            task.cancel()
 
-        logger.info(
-            f"Shutdown waiting: active clients = {active}, "
-            f"remaining ~{remaining:.0f} sec..."
-        )
 
-        await asyncio.sleep(poll_interval)
+async def _shutdown_broadcast(manager: ConnectionManager, message: str) -> None:
+    try:
+        await manager.broadcast(message)
+    except Exception as exc:
+        logger.error("Shutdown broadcast failed: {}", exc)
@@ -1,18 +1,21 @@
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 
 from src.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Sync TestClient for WebSocket tests."""
+    """Sync TestClient for WebSocket tests, shared by the whole session."""
     return TestClient(app)
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def async_client():
-    """Async HTTP client."""
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    """Async HTTP client, shared by the whole session."""
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
         yield ac
@@ -1,8 +1,43 @@
-from unittest.mock import AsyncMock
+import asyncio
+
+from fastapi.websockets import WebSocketState
 
 
 class FakeWebSocket:
+    """
+    Hand-rolled WebSocket double: records delivered frames instead of
+    mocking calls, so tests with many clients stay cheap.
+    """
+
     def __init__(self):
-        self.accept = AsyncMock()
-        self.send_text = AsyncMock()
-        self.close = AsyncMock()
+        self.client_state = WebSocketState.CONNECTED
+        self.application_state = WebSocketState.CONNECTED
+        self.sent = []  # delivered payloads in order: str for text, bytes for binary
+        self.last_text = None
+        self.closed = False
+        # optional coroutine functions run before a send/close completes;
+        # raise or block in them to simulate broken or stalled peers
+        self.on_send = None
+        self.on_close = None
+
+    async def accept(self):
+        pass
+
+    async def send(self, message):
+        if self.on_send is not None:
+            await self.on_send(message)
+        if "text" in message:
+            self.last_text = message["text"]
+            self.sent.append(message["text"])
+        else:
+            self.sent.append(message["bytes"])
+
+    async def close(self, code=1000, reason=None):
+        if self.on_close is not None:
+            await self.on_close()
+        self.closed = True
+
+
+async def never_completes(*_):
+    """Hook for a peer that accepted the frame but never drains it."""
+    await asyncio.Event().wait()
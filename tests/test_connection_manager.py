@@ -1,14 +1,18 @@
+import asyncio
+import time
+
 import pytest
+from fastapi.websockets import WebSocketState
 
 from src.connection_manager import ConnectionManager
-from tests.helpers.fake_websocket import FakeWebSocket
+from tests.helpers.fake_websocket import FakeWebSocket, never_completes
 
 
 @pytest.mark.asyncio
 async def test_connect_and_disconnect():
     manager = ConnectionManager()
     manager._ws_to_info.clear()
-    manager._id_to_ws.clear()
+    manager._id_to_info.clear()
 
     ws = FakeWebSocket()
 
@@ -16,16 +20,20 @@ async def test_connect_and_disconnect():
 
     assert await manager.count() == 1
     assert client_id.startswith("cli_")
+    assert not manager.all_disconnected.is_set()
+    assert manager.has_connections.is_set()
 
     await manager.disconnect(ws)
     assert await manager.count() == 0
+    assert manager.all_disconnected.is_set()
+    assert not manager.has_connections.is_set()
 
 
 @pytest.mark.asyncio
 async def test_broadcast_message():
     manager = ConnectionManager()
     manager._ws_to_info.clear()
-    manager._id_to_ws.clear()
+    manager._id_to_info.clear()
 
     ws1 = FakeWebSocket()
     ws2 = FakeWebSocket()
@@ -34,16 +42,76 @@ async def test_broadcast_message():
     await manager.connect(ws2)
 
     await manager.broadcast("hello")
+    await manager.flush()
 
-    ws1.send_text.assert_called_with("hello")
-    ws2.send_text.assert_called_with("hello")
+    assert ws1.last_text == "hello"
+    assert ws2.last_text == "hello"
 
 
 @pytest.mark.asyncio
 async def test_close_all_connections():
     manager = ConnectionManager()
     manager._ws_to_info.clear()
-    manager._id_to_ws.clear()
+    manager._id_to_info.clear()
+
+    ws1 = FakeWebSocket()
+    ws2 = FakeWebSocket()
+
+    await manager.connect(ws1)
+    await manager.connect(ws2)
+
+    await manager.close_all()
+
+    assert await manager.count() == 0
+    assert ws1.closed
+    assert ws2.closed
+
+
+@pytest.mark.asyncio
+async def test_broadcast_removes_dead_connections():
+    manager = ConnectionManager()
+
+    alive = FakeWebSocket()
+    dead = FakeWebSocket()
+
+    async def broken_send(message):
+        raise RuntimeError("socket closed")
+
+    dead.on_send = broken_send
+
+    await manager.connect(alive)
+    await manager.connect(dead)
+
+    await manager.broadcast("hello")
+    await manager.flush()
+
+    assert alive.last_text == "hello"
+    assert await manager.count() == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others():
+    manager = ConnectionManager()
+
+    fast = FakeWebSocket()
+    slow = FakeWebSocket()
+    slow.on_send = never_completes
+
+    await manager.connect(fast)
+    await manager.connect(slow)
+
+    await manager.broadcast("hello")
+    await asyncio.sleep(0.01)
+
+    assert fast.last_text == "hello"
+    assert await manager.count() == 2
+
+    await manager.close_all()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_bytes_shares_payload():
+    manager = ConnectionManager()
 
     ws1 = FakeWebSocket()
     ws2 = FakeWebSocket()
@@ -51,8 +119,149 @@ async def test_close_all_connections():
     await manager.connect(ws1)
     await manager.connect(ws2)
 
+    payload = "привіт".encode()
+    await manager.broadcast_bytes(payload)
+    await manager.flush()
+
+    assert ws1.sent[0] is payload
+    assert ws2.sent[0] is payload
+    assert ws1.last_text is None
+
+
+@pytest.mark.asyncio
+async def test_check_connections_evicts_closed_sockets():
+    manager = ConnectionManager()
+
+    alive = FakeWebSocket()
+    closed = FakeWebSocket()
+
+    await manager.connect(alive)
+    await manager.connect(closed)
+
+    closed.client_state = WebSocketState.DISCONNECTED
+    await manager._check_connections()
+
+    assert await manager.count() == 1
+    assert alive.sent == []
+
     await manager.close_all()
 
+
+@pytest.mark.asyncio
+async def test_broadcast_skips_excluded():
+    manager = ConnectionManager()
+
+    sender = FakeWebSocket()
+    receiver = FakeWebSocket()
+
+    await manager.connect(sender)
+    await manager.connect(receiver)
+
+    await manager.broadcast("hello", exclude={sender})
+    await manager.flush()
+
+    assert receiver.last_text == "hello"
+    assert sender.sent == []
+
+
+@pytest.mark.asyncio
+async def test_stalled_client_is_dropped_after_send_timeout(monkeypatch):
+    monkeypatch.setattr("src.connection_manager.SEND_TIMEOUT", 0.01)
+    manager = ConnectionManager()
+
+    stalled = FakeWebSocket()
+    stalled.on_send = never_completes
+
+    await manager.connect(stalled)
+    await manager.broadcast("hello")
+    await manager.flush()
+
+    assert await manager.count() == 0
+    assert stalled.closed
+
+
+@pytest.mark.asyncio
+async def test_batched_broadcast_reaches_everyone(monkeypatch):
+    monkeypatch.setattr("src.connection_manager.BROADCAST_BATCH_SIZE", 2)
+    manager = ConnectionManager()
+
+    sockets = [FakeWebSocket() for _ in range(5)]
+    for ws in sockets:
+        await manager.connect(ws)
+
+    await manager.broadcast("hello")
+    await manager.flush()
+
+    for ws in sockets:
+        assert ws.sent == ["hello"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest_message(monkeypatch):
+    monkeypatch.setattr("src.connection_manager.SEND_QUEUE_SIZE", 2)
+    manager = ConnectionManager()
+
+    released = asyncio.Event()
+
+    async def blocked_send(message):
+        await released.wait()
+
+    ws = FakeWebSocket()
+    ws.on_send = blocked_send
+    await manager.connect(ws)
+
+    await manager.broadcast("m1")
+    await asyncio.sleep(0)  # writer picks up m1 and blocks on it
+    for message in ("m2", "m3", "m4"):
+        await manager.broadcast(message)
+
+    released.set()
+    await manager.flush()
+
+    assert ws.sent == ["m1", "m3", "m4"]
+
+
+@pytest.mark.asyncio
+async def test_close_all_does_not_wait_for_stuck_close(monkeypatch):
+    monkeypatch.setattr("src.connection_manager.CLOSE_TIMEOUT", 0.01)
+    manager = ConnectionManager()
+
+    stuck = FakeWebSocket()
+    stuck.on_close = never_completes
+    await manager.connect(stuck)
+
+    await asyncio.wait_for(manager.close_all(), timeout=1)
+
     assert await manager.count() == 0
-    ws1.close.assert_called_once()
-    ws2.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_snapshot_is_reused_until_membership_changes():
+    manager = ConnectionManager()
+
+    ws1 = FakeWebSocket()
+    await manager.connect(ws1)
+    snapshot = manager._connections()
+    assert manager._connections() is snapshot
+
+    ws2 = FakeWebSocket()
+    await manager.connect(ws2)
+    assert len(manager._connections()) == 2
+
+    await manager.disconnect(ws1)
+    assert [info.ws for info in manager._connections()] == [ws2]
+
+
+@pytest.mark.asyncio
+async def test_active_clients_report_wall_clock_times():
+    manager = ConnectionManager()
+
+    ws = FakeWebSocket()
+    client_id = await manager.connect(ws)
+
+    info = (await manager.get_active_clients())[client_id]
+    assert abs(info["connected_at"] - time.time()) < 1
+    assert abs(info["last_active"] - time.time()) < 1
+    assert 0 <= info["connection_duration"] < 1
+
+    await manager.disconnect(ws)
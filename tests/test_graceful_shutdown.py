@@ -1,28 +1,86 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.connection_manager import ConnectionManager
 from src.utils import graceful_shutdown
+from tests.helpers.fake_websocket import FakeWebSocket, never_completes
 
 
-@pytest.mark.asyncio
-async def test_graceful_shutdown_waits_and_exits():
+def make_manager(active: int) -> MagicMock:
     manager = MagicMock()
-    manager.count = AsyncMock(side_effect=[2, 1, 0])
+    manager.all_disconnected = asyncio.Event()
+    if active == 0:
+        manager.all_disconnected.set()
+    manager.size = active
     manager.broadcast = AsyncMock()
     manager.close_all = AsyncMock()
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_graceful_shutdown_waits_and_exits():
+    manager = make_manager(active=2)
+    asyncio.get_running_loop().call_later(0.05, manager.all_disconnected.set)
+
+    await asyncio.wait_for(
+        graceful_shutdown(manager, wait_seconds=3, poll_interval=1), timeout=1
+    )
+
+    manager.close_all.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_graceful_shutdown_without_clients_returns_immediately():
+    manager = make_manager(active=0)
 
     await graceful_shutdown(manager, wait_seconds=3, poll_interval=1)
 
+    manager.broadcast.assert_not_called()
     manager.close_all.assert_not_called()
 
 
 @pytest.mark.asyncio
 async def test_forced_shutdown_after_timeout():
-    manager = MagicMock()
-    manager.count = AsyncMock(return_value=2)
-    manager.close_all = AsyncMock()
+    manager = make_manager(active=2)
 
     await graceful_shutdown(manager, wait_seconds=0, poll_interval=1)
 
     manager.close_all.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_not_delayed_by_stalled_client():
+    manager = ConnectionManager()
+
+    stalled = FakeWebSocket()
+    stalled.on_send = never_completes
+    healthy = FakeWebSocket()
+    await manager.connect(stalled)
+    await manager.connect(healthy)
+
+    # progress broadcasts go out at ~0.1s and ~0.2s, then the forced close
+    await asyncio.wait_for(
+        graceful_shutdown(manager, wait_seconds=0.3, poll_interval=0.01), timeout=2
+    )
+
+    assert await manager.count() == 0
+    assert stalled.closed
+    assert healthy.closed
+    notices = [m for m in healthy.sent if "Server is shutting down" in m]
+    assert len(notices) >= 2
+
+
+@pytest.mark.asyncio
+async def test_shutdown_progress_not_gated_by_slow_broadcast():
+    manager = make_manager(active=2)
+    manager.broadcast.side_effect = never_completes
+
+    await asyncio.wait_for(
+        graceful_shutdown(manager, wait_seconds=0.1, poll_interval=0.001), timeout=1
+    )
+
+    # every notice is started, none is awaited before the next poll
+    assert manager.broadcast.await_count > 1
+    manager.close_all.assert_called_once()
@@ -0,0 +1,55 @@
+import asyncio
+import signal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.signal_handler import SignalHandler
+
+
+@pytest.mark.asyncio
+async def test_signal_burst_runs_one_shutdown_and_forwards_once(monkeypatch):
+    released = asyncio.Event()
+
+    async def slow_shutdown(manager):
+        await released.wait()
+
+    shutdown = AsyncMock(side_effect=slow_shutdown)
+    monkeypatch.setattr("src.signal_handler.graceful_shutdown", shutdown)
+    monkeypatch.setattr("src.signal_handler.connection_manager", MagicMock())
+
+    handler = SignalHandler()
+    handler.restore_original_handlers = MagicMock()
+    handler.forward_signal = AsyncMock()
+
+    # the storm lands while the graceful shutdown is still waiting
+    burst = [asyncio.create_task(handler.handle(signal.SIGTERM)) for _ in range(5)]
+    await asyncio.sleep(0)
+    released.set()
+    await asyncio.gather(*burst)
+
+    shutdown.assert_awaited_once()
+    handler.restore_original_handlers.assert_called_once()
+    handler.forward_signal.assert_awaited_once_with(signal.SIGTERM)
+
+
+@pytest.mark.asyncio
+async def test_install_falls_back_without_loop_signal_support(monkeypatch):
+    loop = asyncio.get_running_loop()
+
+    def unsupported(*args):
+        raise NotImplementedError
+
+    monkeypatch.setattr(loop, "add_signal_handler", unsupported)
+
+    handler = SignalHandler()
+    handler.handle = AsyncMock()
+    handler.install()
+    try:
+        signal.getsignal(signal.SIGTERM)(signal.SIGTERM, None)
+        await asyncio.sleep(0.01)
+    finally:
+        handler.restore_original_handlers()
+
+    handler.handle.assert_awaited_once_with(signal.SIGTERM)
+    assert signal.getsignal(signal.SIGTERM) is handler.original[signal.SIGTERM]
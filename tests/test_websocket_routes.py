@@ -1,12 +1,76 @@
-from fastapi.testclient import TestClient
+import asyncio
 
-from src.main import app
+import pytest
 
+from src.connection_manager import ConnectionManager
+from src.routers.websocket import websocket_endpoint
+from tests.helpers.fake_websocket import FakeWebSocket, never_completes
 
-def test_websocket_connection():
-    client = TestClient(app)
 
+def test_websocket_connection(client):
     with client.websocket_connect("/ws") as websocket:
         websocket.send_text("ping")
         response = websocket.receive_text()
         assert response
+
+
+def test_websocket_ping_and_echo(client):
+    with client.websocket_connect("/ws") as websocket:
+        assert websocket.receive_text().startswith("Welcome!")
+
+        websocket.send_text(" PING ")
+        assert websocket.receive_text() == "pong"
+
+        websocket.send_text("ping me")
+        assert websocket.receive_text() == "Echo: ping me"
+
+        websocket.send_text("/broadcast   ")
+        assert websocket.receive_text() == "Echo: /broadcast   "
+
+
+class IdleWebSocket(FakeWebSocket):
+    """A client that stays connected but never sends anything."""
+
+    async def receive_text(self):
+        await never_completes()
+
+
+@pytest.mark.asyncio
+async def test_idle_client_sharing_id_is_kept(monkeypatch):
+    manager = ConnectionManager()
+    monkeypatch.setattr("src.routers.websocket.connection_manager", manager)
+    monkeypatch.setattr("src.routers.websocket.IDLE_TIMEOUT", 0.01)
+
+    first, second = IdleWebSocket(), IdleWebSocket()
+    endpoints = [
+        asyncio.create_task(websocket_endpoint(ws, client_id="dup"))
+        for ws in (first, second)
+    ]
+    await asyncio.sleep(0.05)
+
+    # a reconnect reusing the id must not get the older socket dropped
+    assert manager.is_connected(first)
+    assert first.last_text == "ping"
+    assert not first.closed
+
+    for task in endpoints:
+        task.cancel()
+    await asyncio.gather(*endpoints, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_client_is_closed(monkeypatch):
+    manager = ConnectionManager()
+    monkeypatch.setattr("src.routers.websocket.connection_manager", manager)
+    monkeypatch.setattr("src.routers.websocket.IDLE_TIMEOUT", 0.01)
+
+    async def broken_send(message):
+        raise RuntimeError("socket closed")
+
+    ws = IdleWebSocket()
+    ws.on_send = broken_send
+
+    await asyncio.wait_for(websocket_endpoint(ws), timeout=1)
+
+    assert not manager.is_connected(ws)
+    assert ws.closed